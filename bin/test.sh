@@ -1,7 +1,14 @@
 #!/bin/bash
 # Run all tests
+# Set TEST_TMPFS=1 to keep the tests' temporary files in a fresh directory on /dev/shm
 set -euxo pipefail
 mkdir -p test-results
-LOGLEVEL=DEBUG poetry run pytest "$@"
+BASETEMP=()
+if [ -n "${TEST_TMPFS:-}" ] && [ -d /dev/shm ] && [ -w /dev/shm ]; then
+  TMPFS_DIR="$(mktemp -d -p /dev/shm pytest-metron-tagger.XXXXXX)"
+  trap 'rm -rf "$TMPFS_DIR"' EXIT
+  BASETEMP=(--basetemp="$TMPFS_DIR")
+fi
+LOGLEVEL=DEBUG poetry run pytest ${BASETEMP[@]+"${BASETEMP[@]}"} "$@"
 # pytest-cov leaves .coverage.$HOST.$PID.$RAND files around while coverage itself doesn't
 poetry run coverage erase || true
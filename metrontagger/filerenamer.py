@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import datetime
 import re
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -20,6 +21,16 @@ from darkseid.utils import unique_file
 from metrontagger.styles import Styles
 from metrontagger.utils import cleanup_string
 
+EMPTY_SEPARATORS_RE = re.compile(r"(\(\s*[-:]*\s*\)|\[\s*[-:]*\s*]|\{\s*[-:]*\s*})")
+DUPLICATE_HYPHEN_UNDERSCORE_RE = re.compile(r"([-_]){2,}")
+FORMAT_MAPPING = {
+    "Hard Cover": "HC",  # Old Metron Value
+    "Hardcover": "HC",
+    "Trade Paperback": "TPB",
+    "Digital Chapters": "Digital Chapter",  # Old Metron Value
+    "Digital Chapter": "Digital Chapter",
+}
+
 
 class FileRenamer:
     """A class for renaming comic book files based on metadata.
@@ -108,6 +119,21 @@ class FileRenamer:
 
         self.template = template
 
+    @staticmethod
+    def _is_token(txt: str) -> bool:
+        """Check if a string is a token.
+
+        This static method determines if a string is a token by checking if it starts and ends with '%'.
+
+        Args:
+            txt: str: The string to check if it is a token.
+
+        Returns:
+            bool: True if the string is a token, False otherwise.
+        """
+
+        return txt[0] == "%" and txt.endswith("%")
+
     def replace_token(
         self: FileRenamer, text: str, value: int | str | None, token: str
     ) -> str:
@@ -124,21 +150,6 @@ class FileRenamer:
             str: The text with the token replaced by the value.
         """
 
-        # helper func
-        def is_token(txt: str) -> bool:
-            """Check if a string is a token.
-
-            This function determines if a string is a token by checking if it starts and ends with '%'.
-
-            Args:
-                txt: str: The string to check if it is a token.
-
-            Returns:
-                bool: True if the string is a token, False otherwise.
-            """
-
-            return txt[0] == "%" and txt.endswith("%")
-
         if value is not None:
             return text.replace(token, str(value))
 
@@ -151,7 +162,7 @@ class FileRenamer:
             # as in "...(of %issuecount%)..."
             if token == "%issuecount%":  # noqa: S105
                 for idx, word in enumerate(text_list):
-                    if token in word and not is_token(text_list[idx - 1]):
+                    if token in word and not self._is_token(text_list[idx - 1]):
                         text_list[idx - 1] = ""
 
             text_list = [x for x in text_list if token not in x]
@@ -171,8 +182,7 @@ class FileRenamer:
         Returns:
             str: The string with empty separators removed.
         """
-        pattern = r"(\(\s*[-:]*\s*\)|\[\s*[-:]*\s*]|\{\s*[-:]*\s*})"
-        return re.sub(pattern, "", value).strip()
+        return EMPTY_SEPARATORS_RE.sub("", value).strip()
 
     @staticmethod
     def _remove_duplicate_hyphen_underscore(value: str) -> str:
@@ -187,7 +197,44 @@ class FileRenamer:
         Returns:
             str: The string with duplicate hyphens and underscores cleaned up.
         """
-        return re.sub(r"([-_]){2,}", r"\1", value)
+        return DUPLICATE_HYPHEN_UNDERSCORE_RE.sub(r"\1", value)
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _format_issue_string(issue: str | None, pad: int) -> str | None:
+        """Format an issue number for the file name.
+
+        This static method pads the issue number with zeros, treating '½' as 0.5. The result is cached, since a
+        batch of comics repeats the same few issue numbers.
+
+        Args:
+            issue: str | None: The issue number to format.
+            pad: int: The number of digits to pad the issue number with.
+
+        Returns:
+            str | None: The formatted issue number, or None if there is no issue number.
+        """
+        if issue is None:
+            return None
+        return IssueString("0.5" if issue == "½" else issue).as_string(pad=pad)
+
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def _get_month_name(month: int | str | None) -> str | None:
+        """Get the name of a month.
+
+        This static method returns the full month name for a month number from 1 to 12. The result is cached, so
+        each month is only formatted once.
+
+        Args:
+            month: int | str | None: The month number.
+
+        Returns:
+            str | None: The name of the month, or None if the value is not a valid month.
+        """
+        if isinstance(month, str | int) and 1 <= int(month) <= 12:  # noqa: PLR2004
+            return datetime.datetime(1970, int(month), 1).strftime("%B")  # noqa: DTZ001
+        return None
 
     def smart_cleanup_string(self: FileRenamer, new_name: str) -> str:
         """Perform smart cleanup on the provided new name string.
@@ -206,13 +253,10 @@ class FileRenamer:
         new_name = self._remove_empty_separators(new_name)
 
         # remove duplicate spaces, duplicate hyphens and underscores, and trailing dashes
-        new_name = re.sub(r"\s+", " ", new_name)  # remove duplicate spaces
+        new_name = " ".join(new_name.split())  # remove duplicate spaces
         new_name = self._remove_duplicate_hyphen_underscore(new_name)
-        new_name = re.sub(
-            r"-{1,2}\s*$", "", new_name
-        )  # remove dash or double dash at end of line
-
-        return new_name.strip()
+        # hyphens are no longer doubled, so at most one dash is left at the end
+        return new_name.removesuffix("-").rstrip()
 
     def determine_name(self: FileRenamer, filename: Path) -> str | None:
         """Determine the new filename based on metadata.
@@ -237,12 +281,7 @@ class FileRenamer:
         new_name = self.replace_token(new_name, series_name, "%series%")
         new_name = self.replace_token(new_name, series_volume, "%volume%")
 
-        if md.issue is None:
-            issue_str = None
-        elif md.issue == "½":
-            issue_str = IssueString("0.5").as_string(pad=self.issue_zero_padding)
-        else:
-            issue_str = IssueString(md.issue).as_string(pad=self.issue_zero_padding)
+        issue_str = self._format_issue_string(md.issue, self.issue_zero_padding)
         new_name = self.replace_token(new_name, issue_str, "%issue%")
 
         new_name = self.replace_token(new_name, md.series.issue_count, "%issuecount%")
@@ -255,15 +294,7 @@ class FileRenamer:
 
         if md.cover_date:
             new_name = self.replace_token(new_name, md.cover_date.month, "%month%")
-            if (
-                isinstance(md.cover_date.month, str | int)
-                and 1 <= int(md.cover_date.month) <= 12  # noqa: PLR2004
-            ):
-                month_name = datetime.datetime(1970, int(md.cover_date.month), 1).strftime(  # noqa: DTZ001
-                    "%B"
-                )
-            else:
-                month_name = None
+            month_name = self._get_month_name(md.cover_date.month)
             new_name = self.replace_token(new_name, month_name, "%month_name%")
 
         new_name = self.replace_token(new_name, md.alternate_series, "%alternateseries%")
@@ -273,14 +304,7 @@ class FileRenamer:
             new_name = self.replace_token(new_name, md.publisher.imprint.name, "%imprint%")
 
         if md.series:
-            format_mapping = {
-                "Hard Cover": "HC",  # Old Metron Value
-                "Hardcover": "HC",
-                "Trade Paperback": "TPB",
-                "Digital Chapters": "Digital Chapter",  # Old Metron Value
-                "Digital Chapter": "Digital Chapter",
-            }
-            format_value = format_mapping.get(md.series.format, "")
+            format_value = FORMAT_MAPPING.get(md.series.format, "")
             new_name = self.replace_token(new_name, format_value, "%format%")
 
         new_name = self.replace_token(new_name, md.age_rating, "%maturityrating%")
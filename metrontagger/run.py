@@ -385,29 +385,6 @@ class Runner:
             return True
         return False
 
-    @staticmethod
-    def _get_duplicate_entry_index(
-        comic_path: str,
-        dups_list: list[DuplicateIssue],
-    ) -> int | None:
-        """Get the index of a duplicate entry in the list.
-
-        This static method searches for the index of a duplicate entry in the list of DuplicateIssue objects based on
-        the provided comic path.
-
-        Args:
-            comic_path: str: The path of the comic to search for.
-            dups_list: list[DuplicateIssue]: The list of DuplicateIssue objects to search within.
-
-        Returns:
-            int | None: The index of the duplicate entry if found, otherwise None.
-        """
-
-        return next(
-            (idx for idx, item in enumerate(dups_list) if comic_path in item.path_),
-            None,
-        )
-
     @staticmethod
     def _update_ci_xml(file_list: list[DuplicateIssue]) -> None:
         """Update ComicInfo metadata in comic archives.
@@ -452,8 +429,8 @@ class Runner:
         ).ask():
             return
 
-        # List of page indexes to delete for each comic.
-        duplicates_lst: list[DuplicateIssue] = []
+        # Page indexes to delete for each comic, keyed by the comic's path.
+        duplicates: dict[str, DuplicateIssue] = {}
         # This Loop runs for each *distinct* hash.
         for count, img_hash in enumerate(distinct_hashes, 1):
             comics_lst = dups_obj.get_comic_list_from_hash(img_hash)
@@ -473,23 +450,14 @@ class Runner:
             # TODO: Give user the option to delete page per book.
             if questionary.confirm("Do you want to remove this image from all comics?").ask():
                 for comic in comics_lst:
-                    if duplicates_lst:
-                        dup_entry_idx = self._get_duplicate_entry_index(
-                            comic.path_,
-                            duplicates_lst,
-                        )
-                        if dup_entry_idx is not None:
-                            di: DuplicateIssue = duplicates_lst[dup_entry_idx]
-                            di.pages_index.append(comic.pages_index[0])
-                        else:
-                            duplicates_lst.append(
-                                DuplicateIssue(comic.path_, [comic.pages_index[0]]),
-                            )
+                    if comic.path_ in duplicates:
+                        duplicates[comic.path_].pages_index.append(comic.pages_index[0])
                     else:
-                        duplicates_lst.append(
-                            DuplicateIssue(comic.path_, [comic.pages_index[0]]),
+                        duplicates[comic.path_] = DuplicateIssue(
+                            comic.path_, [comic.pages_index[0]]
                         )
 
+        duplicates_lst = list(duplicates.values())
         # After building the list let's ask the user if they want to write the changes.
         if (
             duplicates_lst
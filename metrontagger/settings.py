@@ -4,12 +4,38 @@ from __future__ import annotations
 
 import configparser
 import platform
+from functools import lru_cache
 from os import environ
 from pathlib import Path, PurePath
 
 from xdg.BaseDirectory import save_config_path
 
 
+@lru_cache(maxsize=8)
+def _read_settings(
+    settings_file: Path,
+    mtime_ns: int,  # noqa: ARG001
+    size: int,  # noqa: ARG001
+) -> tuple[tuple[str, tuple[tuple[str, str], ...]], ...]:
+    """Parse a settings file into its sections and their options.
+
+    The result is cached on the file's modification time and size, so a file that hasn't
+    changed is only parsed once. The DEFAULT section is read as an ordinary section, which
+    keeps its options from being repeated in every other section.
+
+    Args:
+        settings_file: Path: The settings file to parse.
+        mtime_ns: int: The file's modification time in nanoseconds, used as part of the cache key.
+        size: int: The file's size in bytes, used as part of the cache key.
+
+    Returns:
+        tuple: The sections of the file, each with its options as name and value pairs.
+    """
+    parser = configparser.RawConfigParser(default_section="\0")
+    parser.read(settings_file)
+    return tuple((section, tuple(parser.items(section))) for section in parser.sections())
+
+
 class MetronTaggerSettings:
     """Class for managing Metron Tagger settings.
 
@@ -96,7 +122,15 @@ class MetronTaggerSettings:
         attributes accordingly.
         """
 
-        self.config.read(self.settings_file)
+        stat = self.settings_file.stat()
+        self.config.read_dict(
+            {
+                section: dict(options)
+                for section, options in _read_settings(
+                    self.settings_file, stat.st_mtime_ns, stat.st_size
+                )
+            }
+        )
 
         if self.config.has_option("metron", "user"):
             self.metron_user = self.config["metron"]["user"]
@@ -153,3 +187,5 @@ class MetronTaggerSettings:
 
         with self.settings_file.open("w") as configfile:
             self.config.write(configfile)
+        # The file may be rewritten within the resolution of its modification time.
+        _read_settings.cache_clear()
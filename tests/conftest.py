@@ -1,5 +1,9 @@
+import copy
+import os
+import shutil
 import zipfile
 from argparse import ArgumentParser
+from dataclasses import fields
 from datetime import date
 from io import BytesIO
 from pathlib import Path
@@ -26,6 +30,21 @@ def create_cover_page() -> bytes:
     return buf.getvalue()
 
 
+def clone_metadata(proto: Metadata) -> Metadata:
+    """Shallow copy of a metadata prototype that is safe for a test to mutate.
+
+    The series and every list field get their own copy, the remaining values are immutable
+    and shared with the prototype.
+    """
+    meta_data = copy.copy(proto)
+    meta_data.series = copy.copy(proto.series)
+    for f in fields(meta_data):
+        value = getattr(meta_data, f.name)
+        if isinstance(value, list):
+            setattr(meta_data, f.name, list(value))
+    return meta_data
+
+
 @pytest.fixture(scope="session")
 def parser() -> ArgumentParser:
     return make_parser()
@@ -38,8 +57,8 @@ def talker() -> Talker:
     return Talker(username, password, True, True)
 
 
-@pytest.fixture()
-def fake_tpb_metadata() -> Metadata:
+@pytest.fixture(scope="session")
+def tpb_metadata_proto() -> Metadata:
     meta_data = Metadata()
     meta_data.publisher = Publisher("DC Comics")
     meta_data.series = Series("Batman", volume=1, format="Trade Paperback")
@@ -51,8 +70,8 @@ def fake_tpb_metadata() -> Metadata:
     return meta_data
 
 
-@pytest.fixture()
-def fake_metadata() -> Metadata:
+@pytest.fixture(scope="session")
+def metadata_proto() -> Metadata:
     meta_data = Metadata()
     meta_data.publisher = Publisher("DC Comics")
     meta_data.series = Series("Aquaman", volume=2)
@@ -65,24 +84,54 @@ def fake_metadata() -> Metadata:
 
 
 @pytest.fixture()
-def fake_comic(tmp_path_factory: Path) -> zipfile.ZipFile:
+def fake_tpb_metadata(tpb_metadata_proto: Metadata) -> Metadata:
+    return clone_metadata(tpb_metadata_proto)
+
+
+@pytest.fixture()
+def fake_metadata(metadata_proto: Metadata) -> Metadata:
+    return clone_metadata(metadata_proto)
+
+
+@pytest.fixture(scope="session")
+def fake_comic_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Build the fake comic archive once and share it between tests.
+
+    Under pytest-xdist every worker gets its own basetemp, so the archive is placed in their
+    common parent and published with an atomic rename. Whichever worker finishes first wins,
+    and the others simply reuse its archive.
+    """
+    root = tmp_path_factory.getbasetemp()
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        root = root.parent
+    z_file = root / "fake_comic_template.cbz"
+    if not z_file.exists():
+        tmp_file = z_file.with_suffix(f".{os.getpid()}.tmp")
+        # The cover is an already compressed PNG, so deflating it again is wasted work.
+        with zipfile.ZipFile(
+            tmp_file, mode="w", compression=zipfile.ZIP_STORED, allowZip64=False
+        ) as zf:
+            zf.writestr("cover.jpg", create_cover_page())
+        tmp_file.replace(z_file)
+
+    return z_file
+
+
+@pytest.fixture()
+def fake_comic(tmp_path_factory: pytest.TempPathFactory, fake_comic_template: Path) -> Path:
     z_file = tmp_path_factory.mktemp("comic") / "Aquaman v1 #001 (of 08) (1994).cbz"
-    image_data = create_cover_page()
-    with zipfile.ZipFile(z_file, mode="w") as zf:
-        zf.writestr("cover.jpg", image_data)
+    shutil.copyfile(fake_comic_template, z_file)
 
     return z_file
 
 
 @pytest.fixture()
-def fake_tpb(tmp_path_factory: Path) -> zipfile.ZipFile:
+def fake_tpb(tmp_path_factory: pytest.TempPathFactory, fake_comic_template: Path) -> Path:
     z_file = (
         tmp_path_factory.mktemp("comic")
         / "Batman - The Adventures Continue Season One (2021) "
         "(digital) (Son of Ultron-Empire).cbz"
     )
-    image_data = create_cover_page()
-    with zipfile.ZipFile(z_file, mode="w") as zf:
-        zf.writestr("cover.jpg", image_data)
+    shutil.copyfile(fake_comic_template, z_file)
 
     return z_file
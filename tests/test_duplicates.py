@@ -1,11 +1,14 @@
+from io import BytesIO
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pandas as pd
 import pytest
-from PIL import UnidentifiedImageError
+from imagehash import average_hash
+from PIL import Image, UnidentifiedImageError
 
-from metrontagger.duplicates import DuplicateIssue, Duplicates
+from metrontagger.duplicates import HASH_SIZE, DuplicateIssue, Duplicates
 
 
 @pytest.fixture()
@@ -36,6 +39,8 @@ def test_init(file_lst, expected_length):
     # Assert
     assert len(duplicates._file_lst) == expected_length
     assert duplicates._data_frame is None
+    assert duplicates._hash_cache == {}
+    assert duplicates._thumb_cache == {}
 
 
 @pytest.mark.parametrize(
@@ -56,28 +61,151 @@ def test_image_hashes(mock_comic, duplicates_instance, comic_pages, expected_has
     hashes = duplicates_instance._image_hashes()
 
     # Assert
-    assert len(hashes) == expected_hashes
+    assert len(hashes["hash"]) == expected_hashes
+    assert len(hashes["path"]) == len(hashes["index"]) == expected_hashes
+
+
+def test_image_hashes_keeps_file_order(duplicates_instance):
+    # Arrange
+    def comic_page_hashes(item):
+        return (
+            str(item),
+            np.array([0, 1], dtype=np.int32),
+            np.array([1, len(str(item))], dtype=np.uint64),
+        )
+
+    # Act
+    with patch.object(
+        duplicates_instance, "_comic_page_hashes", side_effect=comic_page_hashes
+    ):
+        hashes = duplicates_instance._image_hashes()
+
+    # Assert
+    assert hashes["path"].tolist() == [
+        str(item) for item in duplicates_instance._file_lst for _ in range(2)
+    ]
+    assert hashes["index"].tolist() == [0, 1] * len(duplicates_instance._file_lst)
+    assert hashes["index"].dtype == np.int32
+    assert hashes["hash"].dtype == np.uint64
+
+
+def test_image_hashes_single_comic(mock_comic):
+    # Arrange
+    duplicates = Duplicates([Path("comic_0.cbz")])
+    mock_comic.return_value.path = Path("comic_0.cbz")
+    mock_comic.return_value.get_number_of_pages.return_value = 0
+
+    # Act
+    with patch("metrontagger.duplicates.ThreadPoolExecutor") as executor:
+        hashes = duplicates._image_hashes()
+
+    # Assert
+    executor.assert_not_called()
+    assert len(hashes["hash"]) == 0
+
+
+def test_comic_page_hashes_decodes_repeated_page_once(mock_comic, duplicates_instance):
+    # Arrange
+    buf = BytesIO()
+    Image.radial_gradient("L").save(buf, format="PNG")
+    mock_comic.return_value.get_number_of_pages.return_value = 3
+    mock_comic.return_value.get_page.return_value = buf.getvalue()
+
+    # Act
+    with patch.object(
+        Duplicates, "_image_thumbnail", wraps=Duplicates._image_thumbnail
+    ) as image_thumbnail:
+        _, pages_index, img_hashes = duplicates_instance._comic_page_hashes(
+            Path("comic_0.cbz")
+        )
+
+    # Assert
+    image_thumbnail.assert_called_once()
+    assert pages_index.tolist() == [0, 1, 2]
+    assert len(set(img_hashes.tolist())) == 1
+
+
+@pytest.mark.parametrize(
+    ("page_format", "expected_error"),
+    [
+        ("JPEG", None),
+        ("PNG", None),
+        ("GIF", None),
+        ("WEBP", None),
+        ("BMP", UnidentifiedImageError),
+    ],
+    ids=["jpeg", "png", "gif", "webp", "bmp"],
+)
+def test_page_thumbnail_formats(duplicates_instance, page_format, expected_error):
+    # Arrange
+    buf = BytesIO()
+    Image.linear_gradient("L").save(buf, format=page_format)
+
+    # Act & Assert
+    if expected_error is None:
+        assert duplicates_instance._page_thumbnail(buf.getvalue()).shape == (8, 8)
+    else:
+        with pytest.raises(expected_error):
+            duplicates_instance._page_thumbnail(buf.getvalue())
+
+
+def test_comic_page_hashes_not_writable(mock_comic, duplicates_instance):
+    # Arrange
+    mock_comic.return_value.path = Path("comic_0.cbz")
+    mock_comic.return_value.is_writable.return_value = False
+
+    # Act
+    hashes = duplicates_instance._comic_page_hashes(Path("comic_0.cbz"))
+
+    # Assert
+    assert hashes[0] == "comic_0.cbz"
+    assert len(hashes[1]) == len(hashes[2]) == 0
+    mock_comic.return_value.get_page.assert_not_called()
+
+
+def test_hash_thumbnails():
+    # Arrange
+    images = [
+        Image.new("RGB", (250, 250), (120, 30, 200)),
+        Image.linear_gradient("L").resize((97, 150)),
+        Image.radial_gradient("L").convert("RGBA"),
+    ]
+    thumbs = np.stack([Duplicates._image_thumbnail(img) for img in images])
+
+    # Act
+    result = Duplicates._hash_thumbnails(thumbs)
+
+    # Assert
+    assert result.dtype == np.uint64
+    assert [f"{img_hash:016x}" for img_hash in result] == [
+        str(average_hash(img)) for img in images
+    ]
+
+
+def test_image_thumbnail_jpeg_draft():
+    # Arrange
+    page = Image.linear_gradient("L").resize((1600, 2400)).convert("RGB")
+    buf = BytesIO()
+    page.save(buf, format="JPEG")
+
+    # Act
+    with Image.open(BytesIO(buf.getvalue())) as img:
+        thumb = Duplicates._image_thumbnail(img)
+        decoded_size = img.size
+
+    # Assert
+    assert decoded_size == (400, 600)
+    assert thumb.shape == (HASH_SIZE, HASH_SIZE)
 
 
 @pytest.mark.parametrize(
     ("comic_hashes", "expected_duplicates"),
     [
-        (
-            [
-                {"path": "comic_1", "index": 0, "hash": "hash1"},
-                {"path": "comic_1", "index": 1, "hash": "hash1"},
-            ],
-            2,
-        ),
-        (
-            [
-                {"path": "comic_1", "index": 0, "hash": "hash1"},
-                {"path": "comic_1", "index": 1, "hash": "hash2"},
-            ],
-            0,
-        ),
+        ({"path": ["comic_1", "comic_1"], "index": [0, 1], "hash": ["hash1", "hash1"]}, 2),
+        ({"path": ["comic_1", "comic_1"], "index": [0, 1], "hash": ["hash1", "hash2"]}, 0),
+        ({"path": [], "index": [], "hash": []}, 0),
     ],
-    ids=["two_duplicates", "no_duplicates"],
+    ids=["two_duplicates", "no_duplicates", "no_pages"],
 )
 def test_get_page_hashes(duplicates_instance, comic_hashes, expected_duplicates):
     # Arrange
@@ -89,6 +217,23 @@ def test_get_page_hashes(duplicates_instance, comic_hashes, expected_duplicates)
         assert len(df) == expected_duplicates
 
 
+def test_get_page_hashes_order(duplicates_instance):
+    # Arrange
+    comic_hashes = {
+        "path": ["comic_1", "comic_1", "comic_2", "comic_2", "comic_3"],
+        "index": [0, 1, 0, 1, 0],
+        "hash": np.array([9, 3, 3, 7, 9], dtype=np.uint64),
+    }
+
+    # Act
+    with patch.object(duplicates_instance, "_image_hashes", return_value=comic_hashes):
+        df = duplicates_instance._get_page_hashes()
+
+    # Assert
+    assert df["hash"].tolist() == [3, 3, 9, 9]
+    assert df["path"].tolist() == ["comic_1", "comic_2", "comic_1", "comic_3"]
+
+
 @pytest.mark.parametrize(
     ("page_hashes", "expected", "description"),
     [
@@ -136,6 +281,35 @@ def test_get_distinct_hashes_errors(page_hashes, expected_exception, description
         duplicates.get_distinct_hashes()
 
 
+@pytest.mark.parametrize(
+    ("data_frame", "expected_cache"),
+    [
+        (
+            pd.DataFrame(
+                [
+                    {"path": "comic_1", "index": 0, "hash": "hash1"},
+                    {"path": "comic_2", "index": 3, "hash": "hash2"},
+                    {"path": "comic_2", "index": 5, "hash": "hash1"},
+                ]
+            ),
+            {"hash1": [("comic_1", 0), ("comic_2", 5)], "hash2": [("comic_2", 3)]},
+        ),
+        (pd.DataFrame(), {}),
+        (None, {}),
+    ],
+    ids=["grouped_hashes", "empty_data_frame", "no_data_frame"],
+)
+def test_build_hash_cache(duplicates_instance, data_frame, expected_cache):
+    # Arrange
+    duplicates_instance._data_frame = data_frame
+
+    # Act
+    duplicates_instance._build_hash_cache()
+
+    # Assert
+    assert duplicates_instance._hash_cache == expected_cache
+
+
 @pytest.mark.parametrize(
     ("comic_hashes", "img_hash", "expected_path", "expected_index"),
     [
@@ -1,30 +1,29 @@
+from dataclasses import replace
+from datetime import date
 from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import patch
 
 import pytest
+from darkseid.metadata import AgeRatings, Basic, Metadata, Publisher, Series
 
 from metrontagger.filerenamer import FileRenamer
+from metrontagger.styles import Styles
 
 
-@pytest.fixture()
+@pytest.fixture(scope="module")
 def metadata():
-    mock_metadata = Mock()
-    mock_metadata.series.name = "Test Series"
-    mock_metadata.series.volume = 1
-    mock_metadata.issue = "1"
-    mock_metadata.issue_count = 5
-    mock_metadata.cover_date.year = 2021
-    mock_metadata.cover_date.month = 5
-    mock_metadata.publisher.name = "Test Publisher"
-    mock_metadata.alternate_series = "Alt Series"
-    mock_metadata.alternate_number = "Alt Number"
-    mock_metadata.alternate_count = "Alt Count"
-    mock_metadata.imprint = "Test Imprint"
-    mock_metadata.series.format = "Hardcover"
-    mock_metadata.age_rating = "PG-13"
-    mock_metadata.series_group = "Group A"
-    mock_metadata.scan_info = "Scan Info"
-    return mock_metadata
+    return Metadata(
+        series=Series("Test Series", volume=1, format="Hardcover", issue_count=5),
+        issue="1",
+        publisher=Publisher("Test Publisher", imprint=Basic("Test Imprint")),
+        cover_date=date(2021, 5, 1),
+        alternate_series="Alt Series",
+        alternate_number="Alt Number",
+        alternate_count=3,
+        age_rating=AgeRatings(comic_rack="Teen"),
+        series_group="Group A",
+        scan_info="Scan Info",
+    )
 
 
 @pytest.mark.parametrize(
@@ -33,8 +32,9 @@ def metadata():
         ("%series% v%volume% #%issue% (%year%)", "Test Series v1 #001 (2021).cbz"),
         ("%series% #%issue% (%year%)", "Test Series #001 (2021).cbz"),
         ("%series% #%issue% (%month_name%)", "Test Series #001 (May).cbz"),
+        ("%series% %format% #%issue%", "Test Series HC #001.cbz"),
     ],
-    ids=["default_template", "no_volume", "month_name"],
+    ids=["default_template", "no_volume", "month_name", "format"],
 )
 def test_determine_name_happy_path(template, expected_name, metadata):
     # Arrange
@@ -50,26 +50,39 @@ def test_determine_name_happy_path(template, expected_name, metadata):
 
 
 @pytest.mark.parametrize(
-    ("issue", "expected_issue_str"),
+    "size", [10, 100, 1000], ids=["10_tokens", "100_tokens", "1000_tokens"]
+)
+def test_determine_name_long_template(size, metadata):
+    # Arrange
+    renamer = FileRenamer(metadata)
+    renamer.set_template(" ".join(["%series%"] * size))
+
+    # Act
+    new_name = renamer.determine_name(Path("test.cbz"))
+
+    # Assert
+    assert new_name == " ".join(["Test Series"] * size) + ".cbz"
+
+
+@pytest.mark.parametrize(
+    ("overrides", "expected_name"),
     [
-        ("1", "001"),
-        ("½", "000.5"),
-        (None, None),
+        ({"issue": "½"}, "Test Series v1 #000.5 (2021).cbz"),
+        ({"issue": None}, "Test Series v1 (2021).cbz"),
+        ({"cover_date": None}, "Test Series v1 #001 (Unknown).cbz"),
     ],
-    ids=["normal_issue", "half_issue", "no_issue"],
+    ids=["half_issue", "no_issue", "no_cover_date"],
 )
-def test_replace_token_issue(issue, expected_issue_str, metadata):
+def test_determine_name_metadata_variants(overrides, expected_name, metadata):
     # Arrange
-    renamer = FileRenamer(metadata)
-    renamer.set_issue_zero_padding(3)
-    metadata.issue = issue
-    text = "%issue%"
+    renamer = FileRenamer(replace(metadata, **overrides))
+    renamer.set_template("%series% v%volume% #%issue% (%year%)")
 
     # Act
-    result = renamer.replace_token(text, expected_issue_str, "%issue%")
+    new_name = renamer.determine_name(Path("test.cbz"))
 
     # Assert
-    assert result == (expected_issue_str or "")
+    assert new_name == expected_name
 
 
 @pytest.mark.parametrize(
@@ -77,8 +90,21 @@ def test_replace_token_issue(issue, expected_issue_str, metadata):
     [
         ("Test %token%", "value", "%token%", "Test value"),
         ("Test %token%", None, "%token%", "Test"),
+        ("%issue%", "001", "%issue%", "001"),
+        ("%issue%", "000.5", "%issue%", "000.5"),
+        ("%issue%", None, "%issue%", ""),
+        ("#%issue% (of %issuecount%)", None, "%issuecount%", "#%issue% "),
+        ("Test of (%issuecount%)", None, "%issuecount%", "Test "),
+    ],
+    ids=[
+        "replace_with_value",
+        "replace_with_none",
+        "normal_issue",
+        "half_issue",
+        "no_issue",
+        "no_issue_count",
+        "no_issue_count_word_before",
     ],
-    ids=["replace_with_value", "replace_with_none"],
 )
 def test_replace_token(text, value, token, expected):
     # Arrange
@@ -93,33 +119,65 @@ def test_replace_token(text, value, token, expected):
 
 
 @pytest.mark.parametrize(
-    ("new_name", "expected"),
-    [
-        ("Test ()", "Test"),
-        ("Test []", "Test"),
-        ("Test {}", "Test"),
-    ],
-    ids=["empty_parentheses", "empty_brackets", "empty_braces"],
+    ("issue", "expected"),
+    [("1", "001"), ("½", "000.5"), (None, None)],
+    ids=["normal_issue", "half_issue", "no_issue"],
+)
+def test_format_issue_string(issue, expected):
+    # Act
+    result = FileRenamer._format_issue_string(issue, 3)
+
+    # Assert
+    assert result == expected
+
+
+def test_format_issue_string_cached():
+    # Arrange
+    FileRenamer._format_issue_string.cache_clear()
+
+    # Act
+    with patch("metrontagger.filerenamer.IssueString") as mock_issue_string:
+        for _ in range(3):
+            FileRenamer._format_issue_string("7", 3)
+    FileRenamer._format_issue_string.cache_clear()
+
+    # Assert
+    mock_issue_string.assert_called_once_with("7")
+
+
+@pytest.mark.parametrize(
+    ("month", "expected"),
+    [(5, "May"), ("12", "December"), (0, None), (13, None), (None, None)],
+    ids=["int_month", "str_month", "month_zero", "month_thirteen", "no_month"],
 )
-def test_remove_empty_separators(new_name, expected):
+def test_get_month_name(month, expected):
     # Act
-    result = FileRenamer._remove_empty_separators(new_name)
+    result = FileRenamer._get_month_name(month)
 
     # Assert
     assert result == expected
 
 
 @pytest.mark.parametrize(
-    ("new_name", "expected"),
+    ("cleanup", "new_name", "expected"),
     [
-        ("Test--Name", "Test-Name"),
-        ("Test__Name", "Test_Name"),
+        (FileRenamer._remove_empty_separators, "Test ()", "Test"),
+        (FileRenamer._remove_empty_separators, "Test []", "Test"),
+        (FileRenamer._remove_empty_separators, "Test {}", "Test"),
+        (FileRenamer._remove_duplicate_hyphen_underscore, "Test--Name", "Test-Name"),
+        (FileRenamer._remove_duplicate_hyphen_underscore, "Test__Name", "Test_Name"),
+    ],
+    ids=[
+        "empty_parentheses",
+        "empty_brackets",
+        "empty_braces",
+        "duplicate_hyphens",
+        "duplicate_underscores",
     ],
-    ids=["duplicate_hyphens", "duplicate_underscores"],
 )
-def test_remove_duplicate_hyphen_underscore(new_name, expected):
+def test_cleanup_helpers(cleanup, new_name, expected):
     # Act
-    result = FileRenamer._remove_duplicate_hyphen_underscore(new_name)
+    result = cleanup(new_name)
 
     # Assert
     assert result == expected
@@ -133,6 +191,8 @@ def test_remove_duplicate_hyphen_underscore(new_name, expected):
         ("Test__Name", "Test_Name"),
         ("Test  Name", "Test Name"),
         ("Test-", "Test"),
+        ("Test --\t", "Test"),
+        ("Test-()-Name", "Test-Name"),
     ],
     ids=[
         "empty_separators",
@@ -140,6 +200,8 @@ def test_remove_duplicate_hyphen_underscore(new_name, expected):
         "duplicate_underscores",
         "duplicate_spaces",
         "trailing_dash",
+        "trailing_double_dash",
+        "separator_between_hyphens",
     ],
 )
 def test_smart_cleanup_string(new_name, expected):
@@ -153,7 +215,6 @@ def test_smart_cleanup_string(new_name, expected):
     assert result == expected
 
 
-# TODO: Need to add tests for mocking of questionary print results.
 @pytest.mark.parametrize(
     (
         "metadata",
@@ -166,41 +227,64 @@ def test_smart_cleanup_string(new_name, expected):
     ),
     [
         # Happy path
-        ({"title": "Comic1"}, "comic1.cbz", "Comic1.cbz", "Comic1.cbz", False, None, None),
+        ({"title": "Comic1"}, "old_comic1.cbz", "Comic1.cbz", "Comic1.cbz", False, None, None),
         # Edge case: new_name is None
         ({"title": "Comic3"}, "comic3.cbz", None, None, False, None, None),
+        # Edge case: no metadata
+        (
+            None,
+            "comic4.cbz",
+            "Comic4.cbz",
+            None,
+            True,
+            "Metadata hasn't been set for {comic}. Skipping...",
+            Styles.WARNING,
+        ),
+        # Edge case: file already has the new name
+        (
+            {"title": "Comic5"},
+            "Comic5.cbz",
+            "Comic5.cbz",
+            None,
+            True,
+            "Filename for '{comic.name}' is already good!",
+            Styles.SUCCESS,
+        ),
     ],
-    ids=["happy_path", "new_name_none"],
+    ids=["happy_path", "new_name_none", "no_metadata", "same_name"],
 )
 def test_rename_file(  # noqa: PLR0913
-    metadata, comic_name, new_name, expected_result, print_called, print_message, print_style
+    tmp_path,
+    metadata,
+    comic_name,
+    new_name,
+    expected_result,
+    print_called,
+    print_message,
+    print_style,
 ):
     # Arrange
-    comic_path = Path(comic_name)
+    comic_path = tmp_path / comic_name
+    comic_path.touch()
     file_renamer = FileRenamer()
     file_renamer.metadata = metadata
-    file_renamer.determine_name = MagicMock(return_value=new_name)
+    file_renamer.determine_name = lambda _: new_name
 
     # Act
-    with (
-        patch("questionary.print") as mock_print,
-        patch(
-            "darkseid.utils.unique_file",
-            return_value=Path(expected_result) if expected_result else None,
-        ),
-        patch(
-            "pathlib.Path.rename",
-            return_value=Path(expected_result) if expected_result else None,
-        ),
-    ):
+    with patch("questionary.print") as mock_print:
         result = file_renamer.rename_file(comic_path)
 
     # Assert
     if print_called:
-        mock_print.assert_called_once_with(print_message, style=print_style)
+        mock_print.assert_called_once_with(
+            print_message.format(comic=comic_path), style=print_style
+        )
     else:
         mock_print.assert_not_called()
     if expected_result:
-        assert result == Path(expected_result)
+        assert result == tmp_path / expected_result
+        assert result.exists()
+        assert not comic_path.exists()
     else:
         assert result is None
+        assert comic_path.exists()
@@ -1,107 +1,211 @@
+import os
 import sys
 from pathlib import Path
-from zipfile import ZipFile
+from types import SimpleNamespace
+from unittest.mock import Mock
 
 import pytest
 from darkseid.comic import Comic, MetadataFormat
 from darkseid.metadata import Metadata
 
-from metrontagger.filesorter import FileSorter
+from metrontagger.filesorter import FileSorter, get_file_size
+from metrontagger.styles import Styles
 
 
-# Skip test for windows, until some with a windows box can help debug this.
+@pytest.fixture(autouse=True)
+def questionary_stub(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Replace questionary in the sorter with a stub that prints nothing.
+
+    confirm() always answers no; tests swap in their own print or confirm as needed.
+    """
+    stub = SimpleNamespace(
+        print=lambda *_args, **_kwargs: None,
+        confirm=lambda *_args, **_kwargs: SimpleNamespace(ask=lambda: False),
+    )
+    monkeypatch.setattr("metrontagger.filesorter.questionary", stub)
+    return stub
+
+
+@pytest.fixture(scope="module")
+def sort_root(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return tmp_path_factory.mktemp("sort")
+
+
+@pytest.fixture()
+def sort_dir(sort_root: Path, request: pytest.FixtureRequest) -> Path:
+    """A sort directory for the test, not yet created, in the module's shared sort root."""
+    return sort_root / request.node.name
+
+
+def make_sized_file(path: Path, size: int) -> Path:
+    """Create a sparse file, so its size is set without writing any data."""
+    path.touch()
+    os.truncate(path, size)
+    return path
+
+
+def write_comic_rack(comic_path: Path, meta_data: Metadata) -> Comic:
+    """Write ComicInfo metadata to a fake comic.
+
+    The fake comic is a fresh copy of an archive without metadata, so there is
+    nothing to remove before writing.
+    """
+    comic = Comic(comic_path)
+    comic.write_metadata(meta_data, MetadataFormat.COMIC_RACK)
+    return comic
+
+
+# _cleanup_metadata only reads these attributes, so plain namespaces are enough.
+@pytest.mark.parametrize(
+    ("meta_data", "expected"),
+    [
+        (
+            SimpleNamespace(
+                publisher=SimpleNamespace(
+                    name="Marvel Comics", imprint=SimpleNamespace(name="Marvel")
+                ),
+                series=SimpleNamespace(name="Spider-Man: Blue", volume=1),
+            ),
+            ("Marvel", "Spider-Man - Blue", "1"),
+        ),
+        (
+            SimpleNamespace(
+                publisher=SimpleNamespace(name="DC Comics", imprint=None),
+                series=SimpleNamespace(name="Batman/Superman", volume=2),
+            ),
+            ("DC Comics", "Batman-Superman", "2"),
+        ),
+        (
+            SimpleNamespace(
+                publisher=SimpleNamespace(name="Image Comics", imprint=None), series=None
+            ),
+            ("Image Comics", None, None),
+        ),
+    ],
+    ids=["with_imprint", "without_imprint", "no_series"],
+)
+def test_cleanup_metadata(
+    meta_data: SimpleNamespace, expected: tuple[str | None, str | None, str | None]
+) -> None:
+    # Act
+    result = FileSorter._cleanup_metadata(meta_data)
+
+    # Assert
+    assert result == expected
+
+
+@pytest.mark.slow
 @pytest.mark.skipif(sys.platform in ["win32"], reason="Skip Windows.")
 def test_sort_comic_with_missing_metadata(
-    fake_comic: ZipFile,
+    fake_comic: Path,
     fake_metadata: Metadata,
-    tmp_path: Path,
+    sort_dir: Path,
 ) -> None:
-    test_dir = tmp_path / "sort10"
-
     fake_metadata.series.volume = None
 
-    comic = Comic(str(fake_comic))
-    if comic.has_metadata(MetadataFormat.COMIC_RACK):
-        comic.remove_metadata(MetadataFormat.COMIC_RACK)
-    comic.write_metadata(fake_metadata, MetadataFormat.COMIC_RACK)
-    file_sorter = FileSorter(str(test_dir))
-    res = file_sorter.sort_comics(Path(str(fake_comic)))
-    assert res is False
+    write_comic_rack(fake_comic, fake_metadata)
+    file_sorter = FileSorter(str(sort_dir))
+    res = file_sorter.sort_comics(fake_comic)
+    assert not res
 
 
+@pytest.mark.slow
 @pytest.mark.skipif(sys.platform in ["win32"], reason="Skip Windows.")
 def test_sort_comic_with_no_series_metadata(
-    fake_comic: ZipFile, fake_metadata: Metadata, tmp_path: Path
+    fake_comic: Path, fake_metadata: Metadata, sort_dir: Path
 ) -> None:
-    test_dir = tmp_path / "sort2"
     fake_metadata.series = None
-    comic = Comic(str(fake_comic))
-    if comic.has_metadata(MetadataFormat.COMIC_RACK):
-        comic.remove_metadata(MetadataFormat.COMIC_RACK)
-    comic.write_metadata(fake_metadata, MetadataFormat.COMIC_RACK)
-    assert comic.has_metadata(MetadataFormat.COMIC_RACK)
-    file_sorter = FileSorter(str(test_dir))
-    res = file_sorter.sort_comics(Path(str(fake_comic)))
-    assert res is False
+    assert write_comic_rack(fake_comic, fake_metadata).has_metadata(MetadataFormat.COMIC_RACK)
+    file_sorter = FileSorter(str(sort_dir))
+    res = file_sorter.sort_comics(fake_comic)
+    assert not res
 
 
+@pytest.mark.slow
 @pytest.mark.skipif(sys.platform in ["win32"], reason="Skip Windows.")
-def test_sort_comic(fake_comic: ZipFile, fake_metadata: Metadata, tmp_path: Path) -> None:
-    test_dir = tmp_path / "sort1"
+def test_sort_comic(fake_comic: Path, fake_metadata: Metadata, sort_dir: Path) -> None:
+    sort_dir.mkdir()
+
+    result_dir = Path(
+        sort_dir,
+        fake_metadata.publisher.name,
+        fake_metadata.series.name,
+        f"v{fake_metadata.series.volume}",
+    )
 
-    test_dir.mkdir()
+    write_comic_rack(fake_comic, fake_metadata)
 
-    result_dir = (
-        test_dir
-        / fake_metadata.publisher.name
-        / fake_metadata.series.name
-        / f"v{fake_metadata.series.volume}"
+    file_sorter = FileSorter(str(sort_dir))
+    res = file_sorter.sort_comics(fake_comic)
+    assert result_dir.is_dir()
+    assert res
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(sys.platform in ["win32"], reason="Skip Windows.")
+def test_sort_tpb(fake_comic: Path, fake_tpb_metadata: Metadata, sort_dir: Path) -> None:
+    sort_dir.mkdir()
+
+    result_dir = Path(
+        sort_dir,
+        fake_tpb_metadata.publisher.name,
+        f"{fake_tpb_metadata.series.name} TPB",
+        f"v{fake_tpb_metadata.series.volume}",
     )
 
-    # Write metadata to fake file
-    comic = Comic(str(fake_comic))
-    if comic.has_metadata(MetadataFormat.COMIC_RACK):
-        comic.remove_metadata(MetadataFormat.COMIC_RACK)
-    comic.write_metadata(fake_metadata, MetadataFormat.COMIC_RACK)
+    write_comic_rack(fake_comic, fake_tpb_metadata)
 
-    file_sorter = FileSorter(str(test_dir))
-    res = file_sorter.sort_comics(Path(str(fake_comic)))
+    file_sorter = FileSorter(str(sort_dir))
+    res = file_sorter.sort_comics(fake_comic)
     assert result_dir.is_dir()
-    assert res is True
+    assert res
 
 
-@pytest.mark.skipif(sys.platform in ["win32"], reason="Skip Windows.")
-def test_sort_tpb(fake_comic: ZipFile, fake_tpb_metadata: Metadata, tmp_path: Path) -> None:
-    test_dir = tmp_path / "sort1"
+@pytest.mark.slow
+def test_sort_files_without_metadata(fake_comic: Path, sort_dir: Path) -> None:
+    assert not Comic(str(fake_comic)).has_metadata(MetadataFormat.COMIC_RACK)
 
-    test_dir.mkdir()
+    file_sorter = FileSorter(str(sort_dir))
+    res = file_sorter.sort_comics(fake_comic)
+    assert not res
+    assert fake_comic.exists()
 
-    result_dir = (
-        test_dir
-        / fake_tpb_metadata.publisher.name
-        / f"{fake_tpb_metadata.series.name} TPB"
-        / f"v{fake_tpb_metadata.series.volume}"
-    )
 
-    # Write metadata to fake file
-    comic = Comic(str(fake_comic))
-    if comic.has_metadata(MetadataFormat.COMIC_RACK):
-        comic.remove_metadata(MetadataFormat.COMIC_RACK)
-    comic.write_metadata(fake_tpb_metadata, MetadataFormat.COMIC_RACK)
+@pytest.mark.parametrize(
+    ("size", "expected_mb"),
+    [(0, 0.0), (1048576, 1.0), (2621440, 2.5)],
+    ids=["empty", "one_mb", "two_and_a_half_mb"],
+)
+def test_get_file_size(tmp_path: Path, size: int, expected_mb: float) -> None:
+    # Arrange
+    comic = make_sized_file(tmp_path / "comic.cbz", size)
 
-    file_sorter = FileSorter(str(test_dir))
-    res = file_sorter.sort_comics(Path(str(fake_comic)))
-    assert result_dir.is_dir()
-    assert res is True
+    # Act
+    result = get_file_size(comic)
 
+    # Assert
+    assert result == expected_mb
 
-def test_sort_files_without_metadata(fake_comic: ZipFile, tmp_path: Path) -> None:
-    test_dir = tmp_path / "sort2"
-    # If we add more tests we should probably create another tmpfile
-    # since we are removing the metadata from the tmpfile
-    comic = Comic(str(fake_comic))
-    comic.remove_metadata(MetadataFormat.COMIC_RACK)
 
-    file_sorter = FileSorter(str(test_dir))
-    res = file_sorter.sort_comics(Path(str(fake_comic)))
-    assert res is False
+@pytest.mark.parametrize("overwrite", [True, False], ids=["overwrite", "keep_existing"])
+def test_overwrite_existing(
+    tmp_path: Path, questionary_stub: SimpleNamespace, overwrite: bool
+) -> None:
+    # Arrange
+    new_path = tmp_path / "sorted"
+    new_path.mkdir()
+    existing = make_sized_file(new_path / "comic.cbz", 1048576)
+    old_comic = make_sized_file(tmp_path / "comic.cbz", 2097152)
+    questionary_stub.print = Mock()
+    questionary_stub.confirm = lambda *_args, **_kwargs: SimpleNamespace(ask=lambda: overwrite)
+
+    # Act
+    FileSorter._overwrite_existing(new_path, old_comic)
+
+    # Assert
+    questionary_stub.print.assert_called_once_with(
+        f"comic.cbz exists at {new_path}.\nOld file: 1.00 MB -> New file: 2.00 MB",
+        Styles.WARNING,
+    )
+    assert existing.exists() is not overwrite
+    assert old_comic.exists()
@@ -1,19 +1,28 @@
 import logging
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import pytest
 
 from metrontagger.logging import init_logging
-from metrontagger.settings import MetronTaggerSettings
 
 LOG_FMT = "{asctime} - {name} - {levelname} - {message}"
 DATE_FMT = "%Y-%m-%d %H:%M:%S"
 
 
+@pytest.fixture(autouse=True)
+def _isolate_root_logger():
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    root.handlers.clear()
+    yield
+    root.handlers[:] = saved_handlers
+    root.setLevel(saved_level)
+
+
 def test_init_logging_happy_path(tmp_path):
     # Arrange
-    config = MagicMock(spec=MetronTaggerSettings)
-    config.get_settings_folder.return_value = tmp_path
+    config = SimpleNamespace(get_settings_folder=lambda: tmp_path)
 
     # Act
     with patch("logging.FileHandler") as mock_file_handler:
@@ -28,7 +37,7 @@ def test_init_logging_happy_path(tmp_path):
     ("config", "expected_exception"),
     [
         (None, AttributeError),
-        (MagicMock(spec=object), AttributeError),
+        (object(), AttributeError),
     ],
     ids=["none_config", "invalid_config"],
 )
@@ -1,43 +1,29 @@
 from argparse import ArgumentParser
 from pathlib import Path
 
-
-def test_path_options(parser: ArgumentParser, tmpdir: Path) -> None:
-    parsed = parser.parse_args([str(tmpdir)])
-    assert parsed.path == [str(tmpdir)]
-
-
-def test_online_option(parser: ArgumentParser, tmpdir: Path) -> None:
-    parsed = parser.parse_args(["-o", str(tmpdir)])
-    assert parsed.online is True
-    assert parsed.path == [str(tmpdir)]
-
-
-def test_id_option(parser: ArgumentParser, tmpdir: Path) -> None:
-    parsed = parser.parse_args(["--id", "1", str(tmpdir)])
-    assert parsed.id == "1"
-    assert parsed.path == [str(tmpdir)]
-
-
-def test_delete_option(parser: ArgumentParser, tmpdir: Path) -> None:
-    parsed = parser.parse_args(["-d", str(tmpdir)])
-    assert parsed.delete is True
-    assert parsed.path == [str(tmpdir)]
-
-
-def test_missing_option(parser: ArgumentParser, tmpdir: Path) -> None:
-    parsed = parser.parse_args(["--missing", str(tmpdir)])
-    assert parsed.missing is True
-    assert parsed.path == [str(tmpdir)]
-
-
-def test_rename_option(parser: ArgumentParser, tmpdir: Path) -> None:
-    parsed = parser.parse_args(["-r", str(tmpdir)])
-    assert parsed.rename is True
-    assert parsed.path == [str(tmpdir)]
-
-
-def test_ignore_option(parser: ArgumentParser, tmpdir: Path) -> None:
-    parsed = parser.parse_args(["--ignore-existing", str(tmpdir)])
-    assert parsed.ignore_existing is True
-    assert parsed.path == [str(tmpdir)]
+import pytest
+
+
+def test_path_options(parser: ArgumentParser, tmp_path: Path) -> None:
+    parsed = parser.parse_args([str(tmp_path)])
+    assert parsed.path == [str(tmp_path)]
+
+
+@pytest.mark.parametrize(
+    ("flags", "attr", "value"),
+    [
+        (["-o"], "online", True),
+        (["--id", "1"], "id", "1"),
+        (["-d"], "delete", True),
+        (["--missing"], "missing", True),
+        (["-r"], "rename", True),
+        (["--ignore-existing"], "ignore_existing", True),
+    ],
+    ids=["online", "id", "delete", "missing", "rename", "ignore_existing"],
+)
+def test_options(
+    parser: ArgumentParser, tmp_path: Path, flags: list[str], attr: str, value: bool | str
+) -> None:
+    parsed = parser.parse_args([*flags, str(tmp_path)])
+    assert getattr(parsed, attr) == value
+    assert parsed.path == [str(tmp_path)]
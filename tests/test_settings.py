@@ -1,16 +1,18 @@
+import configparser
 from pathlib import Path
+from unittest.mock import patch
 
 from metrontagger.settings import MetronTaggerSettings
 
 
-def test_settings(tmpdir: Path) -> None:
+def test_settings(tmp_path: Path) -> None:
     user = "test"
     dummy = "dummy_value"
     padding = 4
     cleanup = False
     file_template = "%series% v%volume% #%issue% (of %issuecount%) (%year%)"
 
-    config = MetronTaggerSettings(config_dir=str(tmpdir))
+    config = MetronTaggerSettings(config_dir=str(tmp_path))
     # Make sure initial values are correct
     assert not config.metron_user
     assert not config.metron_pass
@@ -27,10 +29,30 @@ def test_settings(tmpdir: Path) -> None:
     config.rename_template = file_template
     config.save()
     # Now load that file and verify the contents
-    new_config = MetronTaggerSettings(config_dir=str(tmpdir))
+    new_config = MetronTaggerSettings(config_dir=str(tmp_path))
     assert new_config.metron_user == user
     assert new_config.metron_pass == dummy
     assert not new_config.sort_dir
     assert new_config.rename_issue_number_padding == padding
     assert new_config.rename_use_smart_string_cleanup == cleanup
     assert new_config.rename_template == file_template
+
+
+def test_settings_parsed_once(tmp_path: Path) -> None:
+    config = MetronTaggerSettings(config_dir=str(tmp_path))
+    config.sort_dir = str(tmp_path / "sorted")
+    config.save()
+    saved = config.settings_file.read_text()
+
+    read = configparser.RawConfigParser.read
+    with patch.object(
+        configparser.RawConfigParser, "read", autospec=True, side_effect=read
+    ) as mock_read:
+        first = MetronTaggerSettings(config_dir=str(tmp_path))
+        second = MetronTaggerSettings(config_dir=str(tmp_path))
+
+    mock_read.assert_called_once()
+    assert first.sort_dir == second.sort_dir == str(tmp_path / "sorted")
+    # The DEFAULT options must not leak into the other sections when saved again.
+    second.save()
+    assert second.settings_file.read_text() == saved
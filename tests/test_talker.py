@@ -2,7 +2,6 @@ import sys
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 from pathlib import Path
-from zipfile import ZipFile
 
 import pytest
 from darkseid.comic import Comic, MetadataFormat
@@ -19,7 +18,7 @@ from metrontagger.talker import InfoSource, Talker
 tzinfo = timezone(timedelta(hours=-5))
 
 
-@pytest.fixture()
+@pytest.fixture(scope="module")
 def test_issue() -> Issue:
     issue = Issue(
         id=31047,
@@ -123,8 +122,8 @@ def test_map_resp_to_metadata_with_no_story_name(
     talker: Talker,
     test_issue: Issue,
 ) -> None:
-    test_data = test_issue
-    test_data.story_titles = []
+    # The issue fixture is shared by the module, so change a copy of it.
+    test_data = test_issue.model_copy(update={"story_titles": []})
     meta_data = talker._map_resp_to_metadata(test_data)
     assert meta_data is not None
     assert len(meta_data.stories) == 0
@@ -136,7 +135,7 @@ def test_map_resp_to_metadata_with_no_story_name(
     assert meta_data.cover_date.year == test_issue.cover_date.year
 
 
-@pytest.fixture()
+@pytest.fixture(scope="module")
 def test_issue_list() -> list[BaseIssue]:
     i_list = [
         BaseIssue(
@@ -180,22 +179,18 @@ def test_issue_list() -> list[BaseIssue]:
     return adapter.validate_python(i_list)
 
 
+@pytest.mark.slow
 def test_process_file(
     talker: Talker,
-    fake_comic: ZipFile,
+    fake_comic: Path,
     test_issue_list: list[BaseIssue],
     mocker: any,
 ) -> None:
-    # Remove any existing metadata from comic fixture
-    ca = Comic(str(fake_comic))
-    if ca.has_metadata(MetadataFormat.COMIC_RACK):
-        ca.remove_metadata(MetadataFormat.COMIC_RACK)
-
     # Mock the call to Metron
     mocker.patch.object(Session, "issues_list", return_value=test_issue_list)
-    talker._process_file(Path(str(fake_comic)), False)
+    talker._process_file(fake_comic, False)
 
-    id_, multiple = talker._process_file(Path(str(fake_comic)), False)
+    id_, multiple = talker._process_file(fake_comic, False)
     assert id_ is None
     assert multiple
     assert fake_comic in [c.filename for c in talker.match_results.multiple_matches]
@@ -206,24 +201,20 @@ def test_process_file(
     assert 2471 in id_list  # noqa: PLR2004
 
 
+@pytest.mark.slow
 @pytest.mark.skipif(sys.platform in ["win32"], reason="Skip Windows.")
 def test_write_issue_md(
     talker: Talker,
-    fake_comic: ZipFile,
+    fake_comic: Path,
     test_issue: Issue,
     mocker: any,
 ) -> None:
-    # Remove any existing metadata from comic fixture
-    ca = Comic(str(fake_comic))
-    if ca.has_metadata(MetadataFormat.COMIC_RACK):
-        ca.remove_metadata(MetadataFormat.COMIC_RACK)
-
     # Mock the call to Metron
     mocker.patch.object(Session, "issue", return_value=test_issue)
-    talker.retrieve_single_issue(Path(str(fake_comic)), 5)
+    talker.retrieve_single_issue(fake_comic, 5)
 
     # Now let's test writing the metadata to file
-    talker._write_issue_md(Path(str(fake_comic)), 1)
+    talker._write_issue_md(fake_comic, 1)
     ca = Comic(str(fake_comic))
     assert ca.has_metadata(MetadataFormat.COMIC_RACK)
     ca_md = ca.read_metadata(MetadataFormat.COMIC_RACK)
@@ -240,21 +231,17 @@ def test_write_issue_md(
     assert ca_md.credits[0].role[0].name == "Writer"
 
 
+@pytest.mark.slow
 @pytest.mark.skipif(sys.platform in ["win32"], reason="Skip Windows.")
 def test_retrieve_single_issue(
     talker: Talker,
-    fake_comic: ZipFile,
+    fake_comic: Path,
     test_issue: Issue,
     mocker: any,
 ) -> None:
-    # Remove any existing metadata from comic fixture
-    ca = Comic(str(fake_comic))
-    if ca.has_metadata(MetadataFormat.COMIC_RACK):
-        ca.remove_metadata(MetadataFormat.COMIC_RACK)
-
     # Mock the call to Metron
     mocker.patch.object(Session, "issue", return_value=test_issue)
-    talker.retrieve_single_issue(Path(str(fake_comic)), 10)
+    talker.retrieve_single_issue(fake_comic, 10)
 
     # Now let's test the metadata
     ca = Comic(str(fake_comic))
@@ -3,6 +3,7 @@ import pytest
 from metrontagger.validate import SchemaVersion, ValidateMetadata
 
 
+@pytest.mark.slow
 @pytest.mark.parametrize(
     ("xml_content", "schema_version", "expected_result"),
     [
@@ -35,6 +36,7 @@ def test_is_valid(xml_content, schema_version, expected_result):
     assert result == expected_result
 
 
+@pytest.mark.slow
 @pytest.mark.parametrize(
     ("xml_content", "expected_version"),
     [